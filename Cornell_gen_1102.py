@@ -1,33 +1,105 @@
+import functools
+import io
 import json
+import mmap
 import sys
+import numpy as np
 from reportlab.lib.pagesizes import A4, landscape, portrait
 from reportlab.lib.colors import black, lightgrey, blue, lightblue,gray
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.ttfonts import TTFont, TTFError
+from reportlab.lib.rl_accel import fp_str
+from reportlab import rl_config
 import os
 
-# Register a font that supports Chinese characters
-def register_chinese_font():
-    # Common Chinese font paths on different systems
-    font_paths = [
+# Skip reportlab's per-primitive shape validation while drawing;
+# everything here is generated geometry, not user-supplied shapes. Set
+# and restored around generation so importing this module leaves
+# reportlab's config alone for other code in the process
+class _no_shape_checking:
+    def __enter__(self):
+        self._prev = rl_config.shapeChecking
+        rl_config.shapeChecking = 0
+
+    def __exit__(self, exc_type, exc, tb):
+        rl_config.shapeChecking = self._prev
+
+# Cache of TTFont objects already registered in this process, so repeated
+# calls (e.g. batch generation) skip path probing and TTC re-parsing
+_REGISTERED_FONTS = {}
+
+# Resolved font path is remembered on disk so later runs skip the
+# os.path.exists probing and go straight to the known-good file
+_FONT_CACHE_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache", "cornell_gen", "font.json")
+
+
+def _read_cached_font_path():
+    try:
+        with open(_FONT_CACHE_FILE, "r", encoding="utf-8") as f:
+            path = json.load(f).get("path")
+        return path if path and os.path.exists(path) else None
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached_font_path(path):
+    try:
+        os.makedirs(os.path.dirname(_FONT_CACHE_FILE), exist_ok=True)
+        with open(_FONT_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"path": path}, f)
+    except OSError:
+        pass  # cache is best-effort; a read-only home dir is fine
+
+# Common Chinese font paths keyed by platform, so only the candidates for
+# the current OS are stat'ed
+PLATFORM_FONTS = {
+    "darwin": (
         "/System/Library/Fonts/PingFang.ttc",  # macOS
         "/System/Library/Fonts/Helvetica.ttc",  # macOS fallback
+    ),
+    "win32": (
         "C:/Windows/Fonts/msyh.ttc",  # Windows Microsoft YaHei
         "C:/Windows/Fonts/simsun.ttc",  # Windows SimSun
+    ),
+    "linux": (
         "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",  # Linux
         "/usr/share/fonts/truetype/arphic/uming.ttc",  # Linux
-    ]
-    
+    ),
+}
+
+# Register a font that supports Chinese characters
+def register_chinese_font():
+    font_paths = PLATFORM_FONTS.get(sys.platform, ())
+
     font_name = "ChineseFont"
-    for path in font_paths:
+    if font_name in _REGISTERED_FONTS or font_name in pdfmetrics.getRegisteredFontNames():
+        return font_name
+    # Try the path cached by a previous run first
+    cached = _read_cached_font_path()
+    candidates = (cached,) + font_paths if cached else font_paths
+    for path in candidates:
         if os.path.exists(path):
             try:
-                pdfmetrics.registerFont(TTFont(font_name, path))
+                # Memory-map the file so the parser reads straight from the
+                # page cache instead of going through buffered file reads
+                with open(path, "rb") as font_file:
+                    mapped = mmap.mmap(font_file.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+                    try:
+                        font = TTFont(font_name, mapped)
+                    finally:
+                        mapped.close()
+                pdfmetrics.registerFont(font)
+                _REGISTERED_FONTS[font_name] = font
+                if path != cached:
+                    _write_cached_font_path(path)
                 return font_name
-            except:
+            except (TTFError, OSError, ValueError):
+                # Unreadable or unsupported font file - try the next one
                 continue
-    
+
     # If no system font found, use default font (may not show Chinese properly)
     return "Helvetica"
 
@@ -53,56 +125,244 @@ PAPER_SIZES = {
 # Conversion factor from mm to points (1 mm = 2.83464566929134 points)
 MM_TO_POINTS = 2.83464566929134
 
+# Use orjson's C parser for config files when it is installed
+try:
+    import orjson
+
+    def _load_config(f):
+        return orjson.loads(f.read())
+except ImportError:
+    def _load_config(f):
+        return json.load(f)
+
+# Parsed configs keyed by (path, mtime) so repeated generation of an
+# unchanged file (batch/server use) skips the JSON parse; returning the
+# same dicts also keeps the id()-keyed resolve caches warm
+_CFG_CACHE = {}
+
+
+def _read_config(config_path):
+    key = (config_path, os.stat(config_path).st_mtime_ns)
+    cfg = _CFG_CACHE.get(key)
+    if cfg is None:
+        with open(config_path, "r", encoding="utf-8") as f:
+            cfg = _load_config(f)
+        _CFG_CACHE[key] = cfg
+    return cfg
+
+# Module configs resolved to point units, keyed by config dict identity so
+# the same module rendered on many pages is only converted once
+_RESOLVED_MODULE_CONFIGS = {}
+
+
+def _resolve_module_config(config):
+    """
+    Convert a module config's mm values to points once and reuse the
+    result when the same config dict is drawn again on later pages
+    """
+    resolved = _RESOLVED_MODULE_CONFIGS.get(id(config))
+    if resolved is None:
+        keyword_label = config.get("keyword_label", "")
+        resolved = {
+            "step": config.get("line_step_mm") * MM_TO_POINTS,
+            "theme_h": config.get("theme_height_mm", 0) * MM_TO_POINTS,
+            "summary_h": config.get("summary_height_mm", 0) * MM_TO_POINTS,
+            "keyword_width_ratio": config.get("keyword_width_ratio", 0.3),
+            "line_style": config.get("line_style", "single_line"),
+            "label_padding": config.get("label_padding", 0),
+            "border_enabled": config.get("border_enabled", True),
+            "title_label": config.get("title_label", ""),
+            # Normalized to a list so the renderer loops unconditionally
+            "keyword_label": (keyword_label if isinstance(keyword_label, list)
+                              else [keyword_label]),
+            "summary_label": config.get("summary_label", "总结"),
+            "row_heights": [h * MM_TO_POINTS for h in config.get("grid_row_heights_mm", [3, 3, 3])],
+            "dot_spacing": config.get("grid_dot_spacing_mm", 20) * MM_TO_POINTS,
+            "english_line_spacing": config.get("grid_line_spacing_mm", 8) * MM_TO_POINTS,
+            "cell_size": config.get("grid_cell_size_mm", 30) * MM_TO_POINTS,
+            # Content hash so identical module configs (e.g. the same
+            # layout repeated on every page) share one form XObject
+            "form_key": "%08x" % (hash(json.dumps(config, sort_keys=True))
+                                  & 0xFFFFFFFF),
+        }
+        _RESOLVED_MODULE_CONFIGS[id(config)] = resolved
+    return resolved
+
+# Page format dicts resolved to page size, step and margins in points,
+# keyed by dict identity like the module-config cache above. Each entry
+# retains the format dict it was keyed by: an id() is only stable while
+# the object lives, and pages without a page_format would otherwise key
+# a transient empty dict whose freed address a later config's real
+# format dict can reuse
+_RESOLVED_PAGE_FORMATS = {}
+
+# Shared default for pages without a page_format, so they all hit one
+# cache entry instead of keying a fresh dict per page
+_DEFAULT_PAGE_FORMAT = {}
+
+
+def _resolve_page_format(format):
+    """
+    Turn a page_format dict into (W, H, step, margins) once and reuse the
+    result when the same dict comes around again (repeated generation of
+    a cached config, or formats shared between pages)
+    """
+    entry = _RESOLVED_PAGE_FORMATS.get(id(format))
+    if entry is not None:
+        return entry[1]
+    page_size = PAPER_SIZES.get(format.get("size", "A4"), A4)
+    if format.get("orientation", "portrait") == "landscape":
+        W, H = landscape(page_size)
+    else:
+        W, H = portrait(page_size)
+    step = format.get("line_step_mm", 9) * MM_TO_POINTS
+
+    # Adjust margins with binding margin consideration
+    # For binding, we add extra base_margin to both sides to allow for proper hole punching/clipboarding
+    # Support for individual binding margins
+    base_margin = format.get("base_margin", 0)
+    resolved = (
+        W, H, step,
+        format.get("left_binding_margin", 0) + base_margin,
+        format.get("right_binding_margin", 0) + base_margin,
+        format.get("top_binding_margin", 0) + base_margin,
+        format.get("bottom_binding_margin", 0) + base_margin,
+    )
+    _RESOLVED_PAGE_FORMATS[id(format)] = (format, resolved)
+    return resolved
+
+# Section configs and heights per page, keyed by page-config identity
+# like the format cache above, so repeated renders of the same page dict
+# skip the dict walking and mm conversion
+_RESOLVED_PAGE_LAYOUTS = {}
+
+
+def _resolve_page_layout(page_cfg):
+    """
+    Pull a page's section configs and their heights in points out once
+    and reuse them when the same page dict is rendered again
+    """
+    resolved = _RESOLVED_PAGE_LAYOUTS.get(id(page_cfg))
+    if resolved is None:
+        header_cfg = page_cfg.get("header", {})
+        footer_cfg = page_cfg.get("footer", {})
+        # Quote configuration is kept separate from the header; a quote
+        # section without a quote_box draws nothing, so the stored config
+        # is normalized to empty (the page loop then skips the renderer
+        # call outright) while its height still reserves layout space
+        quote_cfg = page_cfg.get("quote", {})
+        resolved = (
+            header_cfg, footer_cfg, page_cfg.get("modules", []),
+            quote_cfg if quote_cfg.get("quote_box") else {},
+            header_cfg.get("height_mm", 0) * MM_TO_POINTS,
+            footer_cfg.get("height_mm", 0) * MM_TO_POINTS,
+            quote_cfg.get("height_mm", 0) * MM_TO_POINTS,
+        )
+        _RESOLVED_PAGE_LAYOUTS[id(page_cfg)] = resolved
+    return resolved
+
+
+# Text position calculators indexed by alignment keyword; a dict lookup
+# replaces the per-call if/elif chains (unknown values keep the old
+# fallbacks: bottom and right)
+_VERTICAL_POS = {
+    "top": lambda y, height, text_height, pad: y + height - pad - text_height,
+    "middle": lambda y, height, text_height, pad: y + (height / 2) - (text_height / 2),
+    "bottom": lambda y, height, text_height, pad: y + pad,
+}
+_HORIZONTAL_POS = {
+    "left": lambda x, width, text_width, pad: x + pad,
+    "center": lambda x, width, text_width, pad: x + (width / 2) - (text_width / 2),
+    "right": lambda x, width, text_width, pad: x + width - pad - text_width,
+}
+
+
+def _set_stroke(c, color):
+    """
+    Set the stroke color only when it differs from the tracked one, the
+    same _last_font marker scheme used for setFont: repeated regions in
+    the same color then emit a single RG operator instead of one each
+    """
+    if getattr(c, "_last_stroke", None) is not color:
+        c.setStrokeColor(color)
+        c._last_stroke = color
+
+
+# Read-only default shared by every call instead of allocating a fresh
+# list per invocation
+_DEFAULT_ROW_HEIGHTS = (3, 3, 3)
+
+
 class GridRenderer:
     """
     Handles rendering of different grid types based on struct.md specifications
     """
     
     @staticmethod
-    def draw_four_line_three_grid(c, x, y, width, height, line_spacing=6, row_heights=None):
+    def draw_four_line_three_grid(c, x, y, width, height,
+                                  row_heights=_DEFAULT_ROW_HEIGHTS):
         """
         Draw four-line three-grid pattern (commonly used for Chinese pinyin)
         """
-        if row_heights is None:
-            row_heights = [3, 3, 3]
-            
+        # Cumulative offsets of lines 2-4 within a group, computed once
+        # instead of re-summing row_heights on every iteration
+        off1 = row_heights[0]
+        off2 = off1 + row_heights[1]
+        off3 = off2 + row_heights[2]
         # Calculate how many groups can be drawn
-        total_row_height = sum(row_heights)
-        n = int(height // total_row_height)
-        for i in range(n):
-            base_y = y - i * total_row_height
+        n = int(height // off3)
+        right = x + width
+        # Accumulate all lines of each stroke style into one path so the PDF
+        # gets a single stroke operation per style instead of one per line
+        grey_dashed = c.beginPath()   # lines 1 and 4 - grey dashed
+        blue_solid = c.beginPath()    # lines 2 and 3 - blue solid
+        for base_y in (y - np.arange(n) * off3).tolist():
             # Line 1 - light grey dashed line
-            c.setStrokeColor(gray)
-            c.setDash(1, 2)
-            c.line(x, base_y, x + width, base_y)
-            c.setDash()
-            # Line 2 - blue dash line
-            #c.setDash(1,2)
-            c.setStrokeColor(lightblue)
-            c.line(x, base_y - row_heights[0], x + width, base_y - row_heights[0])
+            grey_dashed.moveTo(x, base_y)
+            grey_dashed.lineTo(right, base_y)
+            # Line 2 - blue solid line
+            blue_solid.moveTo(x, base_y - off1)
+            blue_solid.lineTo(right, base_y - off1)
             # Line 3 - blue solid line
-            c.line(x, base_y - row_heights[0] - row_heights[1], x + width, base_y - row_heights[0] - row_heights[1])
-            # Line 4 - light grey solid line
-            c.setDash(1,2)
-            c.setStrokeColor(gray)
-            c.line(x, base_y - row_heights[0] - row_heights[1] - row_heights[2], 
-                   x + width, base_y - row_heights[0] - row_heights[1] - row_heights[2])
-            c.setDash()
+            blue_solid.moveTo(x, base_y - off2)
+            blue_solid.lineTo(right, base_y - off2)
+            # Line 4 - light grey dashed line
+            grey_dashed.moveTo(x, base_y - off3)
+            grey_dashed.lineTo(right, base_y - off3)
+        _set_stroke(c, gray)
+        c.setDash(1, 2)
+        c.drawPath(grey_dashed, stroke=1, fill=0)
+        c.setDash()
+        _set_stroke(c, lightblue)
+        c.drawPath(blue_solid, stroke=1, fill=0)
     @staticmethod
     def draw_dotted_grid(c, x, y, width, height, dot_spacing=20):
         """
         Draw dotted grid pattern
         """
-        c.setFillColor(lightgrey)
         radius = 0.5
         rows = int(height // dot_spacing) + 1
         cols = int(width // dot_spacing) + 1
-        for row in range(rows):
-            for col in range(cols):
-                dot_x = x + col * dot_spacing
-                dot_y = y - row * dot_spacing
-                c.circle(dot_x, dot_y, radius, stroke=0, fill=1)
-        c.setFillColor(black)
+        # Stroke one horizontal line per dot row with a zero-length dash
+        # and round caps: the dash pattern paints one dot per column, so
+        # the whole grid is a single stroked path with rows subpaths
+        # instead of rows*cols dot emissions
+        c.saveState()
+        _set_stroke(c, lightgrey)
+        c.setLineWidth(2 * radius)
+        c.setLineCap(1)  # round caps turn the zero-length dashes into dots
+        c.setDash([0, dot_spacing])
+        # Extend slightly past the last column so its dot is not dropped
+        # at the exact path end
+        right_x = x + (cols - 1) * dot_spacing + 0.01
+        p = c.beginPath()
+        for yy in (y - np.arange(rows) * dot_spacing).tolist():
+            p.moveTo(x, yy)
+            p.lineTo(right_x, yy)
+        c.drawPath(p, stroke=1, fill=0)
+        c.restoreState()
+        # restoreState put back whatever color was current before
+        c._last_stroke = None
 
     @staticmethod
     def draw_english_grid(c, x, y, width, height, line_spacing=8):
@@ -110,22 +370,30 @@ class GridRenderer:
         Draw English writing practice grid (three-line grid)
         """
         n = int(height // line_spacing)
-        for i in range(n):
-            base_y = y - i * line_spacing
-            # Baseline - black solid line
-            c.setStrokeColor(black)
-            c.setDash()
-            c.line(x, base_y, x + width, base_y)
-            # Middle line - grey dashed line
-            c.setStrokeColor(lightgrey)
-            c.setDash(2, 2)
-            c.line(x, base_y - line_spacing/2, x + width, base_y - line_spacing/2)
-            # Top line - grey solid line
-            c.setStrokeColor(lightgrey)
-            c.setDash()
-            c.line(x, base_y - line_spacing, x + width, base_y - line_spacing)
-        c.setStrokeColor(black)
+        # One path per stroke style, stroked once, instead of three state
+        # changes and three line strokes per row
+        baselines = c.beginPath()     # black solid
+        mid_lines = c.beginPath()     # grey dashed
+        top_lines = c.beginPath()     # grey solid
+        # Hoist the per-row invariants; the loop body is then additions only
+        half_spacing = line_spacing / 2
+        right = x + width
+        for base_y in (y - np.arange(n) * line_spacing).tolist():
+            baselines.moveTo(x, base_y)
+            baselines.lineTo(right, base_y)
+            mid_lines.moveTo(x, base_y - half_spacing)
+            mid_lines.lineTo(right, base_y - half_spacing)
+            top_lines.moveTo(x, base_y - line_spacing)
+            top_lines.lineTo(right, base_y - line_spacing)
+        # Stroke grey lines first so black baselines win where a row's top
+        # line coincides with the next row's baseline
+        _set_stroke(c, lightgrey)
+        c.setDash(2, 2)
+        c.drawPath(mid_lines, stroke=1, fill=0)
         c.setDash()
+        c.drawPath(top_lines, stroke=1, fill=0)
+        _set_stroke(c, black)
+        c.drawPath(baselines, stroke=1, fill=0)
 
     @staticmethod
     def draw_tianzige_grid(c, x, y, width, height, cell_size=30):
@@ -134,37 +402,106 @@ class GridRenderer:
         """
         rows = int(height // cell_size)
         cols = int(width // cell_size)
-        for row in range(rows):
-            for col in range(cols):
-                cell_x = x + col * cell_size
-                cell_y = y - row * cell_size
-                # Draw outer box
-                c.rect(cell_x, cell_y - cell_size, cell_size, cell_size)
-                # Draw cross lines
-                c.line(cell_x, cell_y - cell_size/2, cell_x + cell_size, cell_y - cell_size/2)
-                c.line(cell_x + cell_size/2, cell_y - cell_size, cell_x + cell_size/2, cell_y)
+        if rows <= 0 or cols <= 0:
+            return
+        # Cell boxes plus cross lines form a uniform lattice at half-cell
+        # spacing, so canvas.grid() draws the whole block in one call and
+        # each shared edge is stroked exactly once
+        half = cell_size / 2
+        xs = (x + np.arange(2 * cols + 1) * half).tolist()
+        ys = (y - np.arange(2 * rows + 1) * half).tolist()
+        c.grid(xs, ys)
 
     @staticmethod
     def draw_single_line_grid(c, x, y, width, height, line_step):
         """
         Draw single horizontal lines for regular note-taking
         """
-        yy = y
-        while yy > y - height:
-            c.setStrokeColor(lightgrey)
-            c.line(x, yy, x + width, yy)
-            yy -= line_step
+        _set_stroke(c, lightgrey)
+        # Count the lines up front instead of comparing drifting floats;
+        # the tolerance keeps the line at exactly y - height, which the
+        # old accumulating while-loop also drew
+        n = int((height + 1e-6) // line_step) + 1
+        ys = (y - np.arange(n) * line_step).tolist()
+        code = getattr(c, "_code", None)
+        if code is not None:
+            # Emit the stroke operators directly with rl_accel's C float
+            # formatter - one append instead of a path object per region
+            x2 = x + width
+            code.append("\n".join(
+                "%s m %s l" % (fp_str(x, yy), fp_str(x2, yy)) for yy in ys
+            ) + " S")
+        else:
+            p = c.beginPath()
+            for yy in ys:
+                p.moveTo(x, yy)
+                p.lineTo(x + width, yy)
+            c.drawPath(p, stroke=1, fill=0)
 
 
 # Base class for all renderers
+# Grid draw function, resolved-config parameter keys and whether the
+# summary area is drawn as two half-height rows, per line style
+_GRID_STYLES = {
+    "four_line_three_grid": (GridRenderer.draw_four_line_three_grid,
+                             ("row_heights",), True),
+    "single_line": (GridRenderer.draw_single_line_grid, ("step",), False),
+    "dotted": (GridRenderer.draw_dotted_grid, ("dot_spacing",), False),
+    "english_grid": (GridRenderer.draw_english_grid,
+                     ("english_line_spacing",), False),
+    "tianzige": (GridRenderer.draw_tianzige_grid, ("cell_size",), False),
+}
+
+# Border color/style names resolved by one dict lookup instead of an
+# if/elif chain per area; unknown names fall back to black/solid rather
+# than silently keeping whatever color was set last
+_BORDER_COLORS = {
+    "black": black,
+    "lightgrey": lightgrey,
+    "blue": blue,
+    "lightblue": lightblue,
+    "gray": gray,
+}
+_BORDER_DASHES = {
+    "dashed": (2, 2),
+    "dotted": (1, 2),
+}
+
+
+# Measuring walks the font's width tables per character; labels repeat
+# across fields, review boxes and pages, so cache at module level where
+# every renderer instance shares the hits
+@functools.lru_cache(maxsize=4096)
+def _cached_string_width(text, font, size):
+    return pdfmetrics.stringWidth(text, font, size)
+
+
 class BaseRenderer:
     """
     Abstract base class for all component renderers
     """
+    __slots__ = ("canvas", "font")
+
     def __init__(self, canvas, font):
         self.canvas = canvas
         self.font = font
-    
+
+    def _string_width(self, text, size=12):
+        """
+        Measure text width through the shared module-level cache
+        """
+        return _cached_string_width(text, self.font, size)
+
+    def _ensure_font(self, size=12):
+        """
+        Set the canvas font only when it differs from the last one set;
+        the marker lives on the canvas so all renderers on a page share it
+        """
+        key = (self.font, size)
+        if getattr(self.canvas, "_last_font", None) != key:
+            self.canvas.setFont(self.font, size)
+            self.canvas._last_font = key
+
     def draw(self, x, y, width, height, config):
         """
         Abstract method to draw a component
@@ -177,6 +514,8 @@ class TextBoxRenderer(BaseRenderer):
     """
     Renderer for text boxes with various alignment options
     """
+    __slots__ = ()
+
     def draw(self, x, y, width, height, config):
         """
         Draw a box with text, following dynamic sizing rules
@@ -189,29 +528,20 @@ class TextBoxRenderer(BaseRenderer):
         alignment = config.get("alignment", "left")
         vertical_alignment = config.get("vertical_alignment", "top")
         
-        # Get text dimensions
-        text_width = self.canvas.stringWidth(text, self.font, 12)
+        # Get text dimensions; left alignment never uses the width, so
+        # skip measuring in that case
+        text_width = self._string_width(text) if alignment != "left" else 0.0
         text_height = 12
-        
+
         # Get padding configuration
         text_padding = config.get("text_padding", 0)
         vertical_padding = config.get("vertical_padding", 0)
         
-        # Calculate Y position based on vertical alignment
-        if vertical_alignment == "top":
-            text_y = y + height - vertical_padding - text_height
-        elif vertical_alignment == "middle":
-            text_y = y + (height / 2) - (text_height / 2)
-        else:  # bottom
-            text_y = y + vertical_padding
-        
-        # Calculate X position based on horizontal alignment
-        if alignment == "left":
-            text_x = x + text_padding
-        elif alignment == "center":
-            text_x = x + (width / 2) - (text_width / 2)
-        else:  # right
-            text_x = x + width - text_padding - text_width
+        # Look up position calculators by alignment keyword
+        text_y = _VERTICAL_POS.get(vertical_alignment, _VERTICAL_POS["bottom"])(
+            y, height, text_height, vertical_padding)
+        text_x = _HORIZONTAL_POS.get(alignment, _HORIZONTAL_POS["right"])(
+            x, width, text_width, text_padding)
         
         # Draw text
         self.canvas.drawString(text_x, text_y, text)
@@ -222,6 +552,8 @@ class AreaMatrixRenderer(BaseRenderer):
     """
     Renderer for generic rectangular areas with customizable borders, grids and text
     """
+    __slots__ = ()
+
     
     def draw(self, x, y, width, height, config):
         """
@@ -250,20 +582,12 @@ class AreaMatrixRenderer(BaseRenderer):
         Draw border around the area with specified style
         """
         # Set color
-        if color == "black":
-            self.canvas.setStrokeColor(black)
-        elif color == "lightgrey":
-            self.canvas.setStrokeColor(lightgrey)
-        elif color == "blue":
-            self.canvas.setStrokeColor(blue)
-        # Add more colors as needed
+        _set_stroke(self.canvas, _BORDER_COLORS.get(color, black))
         
-        # Set line style
-        if style == "dashed":
-            self.canvas.setDash(2, 2)
-        elif style == "dotted":
-            self.canvas.setDash(1, 2)
-        # solid is default (no dash)
+        # Set line style (solid is default, no dash)
+        dash = _BORDER_DASHES.get(style)
+        if dash:
+            self.canvas.setDash(*dash)
         
         # Get individual border side configurations
         border_sides = config.get("border_sides", {})
@@ -289,25 +613,22 @@ class AreaMatrixRenderer(BaseRenderer):
         """
         Draw specified grid type within the area
         """
-        grid_renderer = GridRenderer()
-        
         if grid_type == "dotted":
             spacing = config.get("grid_spacing", 20) * MM_TO_POINTS
-            grid_renderer.draw_dotted_grid(self.canvas, x, y, width, height, spacing)
+            GridRenderer.draw_dotted_grid(self.canvas, x, y, width, height, spacing)
         elif grid_type == "single_line":
             step = config.get("grid_line_step_mm", 9) * MM_TO_POINTS
-            grid_renderer.draw_single_line_grid(self.canvas, x, y, width, height, step)
+            GridRenderer.draw_single_line_grid(self.canvas, x, y, width, height, step)
         elif grid_type == "four_line_three_grid":
             row_heights_mm = config.get("grid_row_heights_mm", [3, 3, 3])
             row_heights = [h * MM_TO_POINTS for h in row_heights_mm]
-            spacing = config.get("grid_line_spacing_mm", 0) * MM_TO_POINTS
-            grid_renderer.draw_four_line_three_grid(self.canvas, x, y, width, height, spacing, row_heights)
+            GridRenderer.draw_four_line_three_grid(self.canvas, x, y, width, height, row_heights)
         elif grid_type == "english_grid":
             spacing = config.get("grid_line_spacing_mm", 8) * MM_TO_POINTS
-            grid_renderer.draw_english_grid(self.canvas, x, y, width, height, spacing)
+            GridRenderer.draw_english_grid(self.canvas, x, y, width, height, spacing)
         elif grid_type == "tianzige":
             cell_size = config.get("grid_cell_size_mm", 30) * MM_TO_POINTS
-            grid_renderer.draw_tianzige_grid(self.canvas, x, y, width, height, cell_size)
+            GridRenderer.draw_tianzige_grid(self.canvas, x, y, width, height, cell_size)
     
     def _draw_fill_text(self, x, y, width, height, text, config):
         """
@@ -318,25 +639,17 @@ class AreaMatrixRenderer(BaseRenderer):
         text_padding = config.get("text_padding", 2)
         font_size = config.get("font_size", 12)
         
-        self.canvas.setFont(self.font, font_size)
-        text_width = self.canvas.stringWidth(text, self.font, font_size)
+        self._ensure_font(font_size)
+        # Left alignment never uses the width - skip measuring
+        text_width = (self._string_width(text, font_size)
+                      if text_alignment != "left" else 0.0)
         text_height = font_size
         
-        # Calculate Y position based on vertical alignment
-        if vertical_alignment == "top":
-            text_y = y + height - text_padding - text_height
-        elif vertical_alignment == "middle":
-            text_y = y + (height / 2) - (text_height / 2)
-        else:  # bottom
-            text_y = y + text_padding
-        
-        # Calculate X position based on horizontal alignment
-        if text_alignment == "left":
-            text_x = x + text_padding
-        elif text_alignment == "center":
-            text_x = x + (width / 2) - (text_width / 2)
-        else:  # right
-            text_x = x + width - text_padding - text_width
+        # Look up position calculators by alignment keyword
+        text_y = _VERTICAL_POS.get(vertical_alignment, _VERTICAL_POS["bottom"])(
+            y, height, text_height, text_padding)
+        text_x = _HORIZONTAL_POS.get(text_alignment, _HORIZONTAL_POS["right"])(
+            x, width, text_width, text_padding)
         
         # Draw text
         self.canvas.drawString(text_x, text_y, text)
@@ -346,74 +659,90 @@ class HeaderRenderer(BaseRenderer):
     """
     Renderer for the header area with fields
     """
+    __slots__ = ()
+
     def draw(self, x, y, width, height, config):
         """
         Draw the header area (L0[0]) with fields (L1[0-n])
         """
-        self.canvas.setFont(self.font, 12)
+        self._ensure_font()
         field_margin = config.get("field_margin", 0)
         cursor_x = x + field_margin
         fields = config.get("fields", [])
         
-        # Draw header border only if enabled
-        if config.get("border_enabled", True):
-            self.canvas.rect(x, y, width, height, stroke=1, fill=0)
-        
+        field_spacing = config.get("field_spacing", 0)
+        field_vertical_padding = config.get("field_vertical_padding", 0)
         if fields:
-            field_spacing = config.get("field_spacing", 0)
             total_field_width = width - 2 * field_margin - (len(fields) - 1) * field_spacing
             uniform_field_width = total_field_width / len(fields)
-        
+
+        # First pass: measure every field and build its box geometry, so
+        # the drawing pass below issues nothing but draw calls
+        boxes = []
+        text_height = 12
         for field in fields:
-            text_alignment = field.get("text_alignment", "left")
+            text = field["label"]
             text_padding = field.get("text_padding", 2)
-            vertical_alignment = field.get("vertical_alignment", "top")
             vertical_padding = field.get("vertical_padding", 3)
-            
-            text = field["label"]
-            text_width = self.canvas.stringWidth(text, self.font, 12)
-            text_height = 12
-            
+
             # Dynamic sizing based on text
-            field_width = max(uniform_field_width, text_width + 2 * text_padding)
+            field_width = max(uniform_field_width,
+                              self._string_width(text) + 2 * text_padding)
             field_height = max(20, text_height + 2 * vertical_padding)
-            
-            box_y = y - field_height + config.get("field_vertical_padding", 0)
-            
+
             field_config = {
                 "text": text,
                 "text_padding": text_padding,
                 "vertical_padding": vertical_padding,
                 "border_enabled": field.get("border_enabled", True),
-                "alignment": text_alignment,
-                "vertical_alignment": vertical_alignment
+                "alignment": field.get("text_alignment", "left"),
+                "vertical_alignment": field.get("vertical_alignment", "top")
             }
-            
-            text_box_renderer = TextBoxRenderer(self.canvas, self.font)
-            text_box_renderer.draw(cursor_x, box_y, field_width, field_height, field_config)
-            
-            field_spacing = config.get("field_spacing", 0)
+            boxes.append((cursor_x, y - field_height + field_vertical_padding,
+                          field_width, field_height, field_config))
             cursor_x += field_width + field_spacing
 
+        # Second pass: stroke the header border and every field border
+        # as one path - a single stroke operation instead of one rect per
+        # box - then draw the texts
+        p = self.canvas.beginPath()
+        any_border = False
+        # Draw header border only if enabled
+        if config.get("border_enabled", True):
+            p.rect(x, y, width, height)
+            any_border = True
+        for box_x, box_y, field_width, field_height, field_config in boxes:
+            if field_config["border_enabled"]:
+                p.rect(box_x, box_y, field_width, field_height)
+                field_config["border_enabled"] = False
+                any_border = True
+        if any_border:
+            self.canvas.drawPath(p, stroke=1, fill=0)
+
+        text_box_renderer = TextBoxRenderer(self.canvas, self.font)
+        for box_x, box_y, field_width, field_height, field_config in boxes:
+            text_box_renderer.draw(box_x, box_y, field_width, field_height, field_config)
+
 
 class QuoteBoxRenderer(BaseRenderer):
     """
     Renderer for the quote area
     """
+    __slots__ = ()
+
     def draw(self, x, y, width, height, config):
         """
         Draw the quote area (L0[1]) with daily quote text (L1[0])
         """
-        self.canvas.setFont(self.font, 12)
         quote = config.get("quote_box", None)
         if not quote:
             return
+        self._ensure_font()
         
         quote_label_padding = config.get("quote_label_padding", 0)
         quote_vertical_padding = quote.get("vertical_padding", 0)
         
         quote_text = quote["label"]
-        quote_text_width = self.canvas.stringWidth(quote_text, self.font, 12)
         quote_text_height = 12
         
         # Use the height from the config parameter (which is the quote area height)
@@ -440,15 +769,17 @@ class FooterRenderer(BaseRenderer):
     """
     Renderer for the footer area with review boxes
     """
+    __slots__ = ()
+
     def draw(self, x, y, width, height, config):
         """
         Draw the footer area (L0[3]) with review boxes (L1[0-5])
         """
         # Draw footer border only if enabled
         if config.get("border_enabled", True):
-            self.canvas.setStrokeColor(black)
+            _set_stroke(self.canvas, black)
             self.canvas.rect(x, y, width, height, stroke=1, fill=0)
-        self.canvas.setFont(self.font, 12)
+        self._ensure_font()
         
         review_boxes = config.get("review_boxes", [])
         if len(review_boxes) > 0:
@@ -458,14 +789,17 @@ class FooterRenderer(BaseRenderer):
             
             # Position boxes from the left edge
             cursor_x = x
-            
+            box_top_margin = config.get("review_box_top_margin", 0)
+            text_padding = config.get("review_box_text_padding", 0)
+            review_text_alignment = config.get("review_text_alignment", "center")
+            # One renderer for all boxes instead of one per iteration
+            text_box_renderer = TextBoxRenderer(self.canvas, self.font)
+
             for i, label in enumerate(review_boxes):
                 # 使用 footer 的 height 作为 review box 的高度
                 box_height = height
-                box_top_margin = config.get("review_box_top_margin", 0)
-                text_padding = config.get("review_box_text_padding", 0)
-                
-                text_width = self.canvas.stringWidth(label, self.font, 12)
+
+                text_width = self._string_width(label)
                 text_height = 12
                 
                 # Ensure box is wide enough for text
@@ -479,13 +813,12 @@ class FooterRenderer(BaseRenderer):
                     "text_padding": text_padding,
                     "vertical_padding": text_padding,
                     "border_enabled": False,
-                    "alignment": config.get("review_text_alignment", "center"),
+                    "alignment": review_text_alignment,
                     "vertical_alignment": "middle"
                 }
                 
-                text_box_renderer = TextBoxRenderer(self.canvas, self.font)
                 text_box_renderer.draw(cursor_x, box_y, box_w, box_height, box_config)
-                
+
                 # Move cursor to next position (boxes tightly packed)
                 cursor_x += box_w
 
@@ -494,35 +827,59 @@ class CornellModuleRenderer(BaseRenderer):
     """
     Renderer for the Cornell note area with its subdivisions
     """
+    __slots__ = ()
+
     def draw(self, x, y, width, height, config):
         """
-        Draw the Cornell note area (L0[2]) with its subdivisions:
+        Draw the Cornell note area (L0[2]) as a cached Form XObject: the
+        whole module (border, labels and grids) depends only on the config
+        and size, so repeated modules and pages reference one definition
+        """
+        c = self.canvas
+        name = "cornell_module_%s_%s_%s" % (
+            _resolve_module_config(config)["form_key"],
+            round(width, 2), round(height, 2))
+        name = name.replace(".", "_").replace("-", "_")
+        if not c.hasForm(name):
+            # BBox padded so edge strokes survive, as in _draw_grid_region
+            c.beginForm(name, -1, -height - 1, width + 1, 1)
+            # Form content inherits the doForm caller's graphics state,
+            # so the trackers must not elide the first set inside it
+            c._last_stroke = None
+            self._draw_content(0, 0, width, height, config)
+            c.endForm()
+            # Form definition may leave the tracked font/stroke state stale
+            c._last_font = None
+            c._last_stroke = None
+        c.saveState()
+        c.translate(round(x, 2), round(y, 2))
+        c.doForm(name)
+        c.restoreState()
+
+    def _draw_content(self, x, y, width, height, config):
+        """
+        Draw the module's subdivisions:
         - Title section (L1[0])
         - Content section (L1[1]) with:
           - Keywords section (L2[0])
           - Notes section (L2[1])
         - Summary section (L1[2])
         """
-        self.canvas.setFont(self.font, 12)
-        
-        # Convert mm values to points
-        step = config.get("line_step_mm") * MM_TO_POINTS
-        theme_h = config.get("theme_height_mm", 0) * MM_TO_POINTS
-        theme_h = theme_h
-        summary_h = config.get("summary_height_mm", 0) * MM_TO_POINTS
-        keyword_width_ratio = config.get("keyword_width_ratio", 0.3)
-        keyword_w = width * keyword_width_ratio
-        line_style = config.get("line_style", "single_line")
-        label_padding = config.get("label_padding", 0)  # 新增配置项
-        # Draw outer border only if enabled
-        if config.get("border_enabled", True):
-            self.canvas.setStrokeColor(black)
-            self.canvas.rect(x, y - height, width, height, stroke=1, fill=0)
+        self._ensure_font()
+
+        # mm values already converted to points, cached per config dict
+        resolved = _resolve_module_config(config)
+        step = resolved["step"]
+        theme_h = resolved["theme_h"]
+        summary_h = resolved["summary_h"]
+        keyword_w = width * resolved["keyword_width_ratio"]
+        line_style = resolved["line_style"]
+        label_padding = resolved["label_padding"]  # 新增配置项
 
         # Draw section labels
         # Title section label
         if theme_h > 0:
-            title_label = config.get("title_label", "")
+            title_label = resolved["title_label"]
             title_label_x = x + label_padding
             
             # 调整标题标签的Y坐标，使其与第一行格线对齐并居中
@@ -530,223 +887,113 @@ class CornellModuleRenderer(BaseRenderer):
             self.canvas.drawString(title_label_x, title_label_y, title_label)
         
         # Keywords section label
-        keyword_label = config.get("keyword_label", "")
+        keyword_label = resolved["keyword_label"]
         keyword_label_x = x + label_padding
         
         # 调整关键词标签的Y坐标，使其与第一行格线对齐
         keyword_label_y = y - theme_h - step + step / 4
 
-        # Handle keyword_label as list or string
-        if isinstance(keyword_label, list):
-            for i, label in enumerate(keyword_label):
-                label_y = keyword_label_y - i * step
-                self.canvas.drawString(keyword_label_x, label_y, label)
-        else:
-            self.canvas.drawString(keyword_label_x, keyword_label_y, keyword_label)
+        # keyword_label is always a list after config resolution
+        for i, label in enumerate(keyword_label):
+            label_y = keyword_label_y - i * step
+            self.canvas.drawString(keyword_label_x, label_y, label)
         
         # Summary section label
         if summary_h > 0:
-            summary_label = config.get("summary_label", "总结")
+            summary_label = resolved["summary_label"]
             summary_label_x = x + label_padding
             summary_label_y = y - height + summary_h - step + step / 4
             self.canvas.drawString(summary_label_x, summary_label_y, summary_label)
 
-        # Draw grid lines based on configuration
-        grid_renderer = GridRenderer()
-        
-        if line_style == "four_line_three_grid":
-            self._draw_four_line_three_grid_layout(grid_renderer, x, y, width, height, 
-                                                 theme_h, summary_h, keyword_w, config)
-        elif line_style == "single_line":
-            self._draw_single_line_layout(grid_renderer, x, y, width, height, 
-                                        theme_h, summary_h, keyword_w, config)
-        elif line_style == "dotted":
-            self._draw_dotted_grid_layout(grid_renderer, x, y, width, height, 
-                                        theme_h, summary_h, keyword_w, config)
-        elif line_style == "english_grid":
-            self._draw_english_grid_layout(grid_renderer, x, y, width, height, 
-                                         theme_h, summary_h, keyword_w, config)
-        elif line_style == "tianzige":
-            self._draw_tianzige_grid_layout(grid_renderer, x, y, width, height, 
-                                          theme_h, summary_h, keyword_w, config)
-        # blank layout requires no grid drawing
+        # Grid parameters (and their mm-to-points conversion) are resolved
+        # once per config; every style draws the same sub-rectangles, so one
+        # loop over them replaces the five near-identical layout helpers
+        style = _GRID_STYLES.get(line_style)
+        if style is not None:  # blank layout requires no grid drawing
+            grid_fn, param_keys, split_summary = style
+            params = tuple(resolved[k] for k in param_keys)
+            for rx, ry, rw, rh in self._grid_subregions(
+                    x, y, width, height, theme_h, summary_h, keyword_w,
+                    split_summary):
+                # Disabled sections (theme_height_mm 0 etc.) produce
+                # zero-size rectangles - skip them outright
+                if rw > 0 and rh > 0:
+                    self._draw_grid_region(grid_fn, rx, ry, rw, rh, *params)
 
         # 设置分割线颜色为黑色
-        self.canvas.setStrokeColor(black)
+        _set_stroke(self.canvas, black)
 
-        # Draw internal dividing lines - 确保与行格线对齐
+        # Outer border and internal dividing lines share one stroked path
+        # - 确保与行格线对齐
+        p = self.canvas.beginPath()
+        # Draw outer border only if enabled
+        if resolved["border_enabled"]:
+            p.rect(x, y - height, width, height)
         # 标题区底部线：从标题区底部开始
         if theme_h > 0:
-            self.canvas.line(x, y - theme_h, x + width, y - theme_h)  # Title bottom
-        
+            p.moveTo(x, y - theme_h)  # Title bottom
+            p.lineTo(x + width, y - theme_h)
         # 总结区顶部线：从总结区顶部开始
         if summary_h > 0:
-            self.canvas.line(x, y - height + summary_h, x + width, y - height + summary_h)  # Summary top
-        
+            p.moveTo(x, y - height + summary_h)  # Summary top
+            p.lineTo(x + width, y - height + summary_h)
         # 关键词区右侧线：从关键词区右侧开始，垂直方向对齐
-        self.canvas.line(x + keyword_w, y - theme_h, x + keyword_w, y - height + summary_h)  # Keywords right
-
-    def _draw_four_line_three_grid_layout(self, grid_renderer, x, y, width, height, 
-                                        theme_h, summary_h, keyword_w, config):
-        """
-        Draw four-line three-grid pattern in all sections
-        """
-        # Convert mm values to points
-        line_spacing = config.get("grid_line_spacing_mm", 0) * MM_TO_POINTS
-        row_heights = [h * MM_TO_POINTS for h in config.get("grid_row_heights_mm", [3, 3, 3])]
-        
-        # Notes area
-        grid_renderer.draw_four_line_three_grid(
-            self.canvas, x + keyword_w, y - theme_h,
-            width - keyword_w, height - theme_h - summary_h, 
-            line_spacing, row_heights)
-        
-        # Keywords area
-        grid_renderer.draw_four_line_three_grid(
-            self.canvas, x, y - theme_h,
-            keyword_w,
-            height - theme_h - summary_h, line_spacing, row_heights)
-        
-        # Summary area (two rows)
-        grid_renderer.draw_four_line_three_grid(
-            self.canvas, x, y - (height - summary_h),
-            width,
-            summary_h/2, line_spacing, row_heights)
-        
-        grid_renderer.draw_four_line_three_grid(
-            self.canvas, x, y - (height - summary_h/2),
-            width,
-            summary_h/2, line_spacing, row_heights)
-        
-        # Title area
-        grid_renderer.draw_four_line_three_grid(
-            self.canvas, x, y - theme_h,
-            width,
-            theme_h, line_spacing, row_heights)
-
-    def _draw_single_line_layout(self, grid_renderer, x, y, width, height, 
-                               theme_h, summary_h, keyword_w, config):
-        """
-        Draw single horizontal lines in all sections
-        """
-        # Convert mm values to points
-        step = config.get("line_step_mm", 0) * MM_TO_POINTS
-        
-        # Notes area
-        grid_renderer.draw_single_line_grid(
-            self.canvas, x + keyword_w, y - theme_h,
-            width - keyword_w, height - theme_h - summary_h, step)
-        
-        # Keywords area
-        grid_renderer.draw_single_line_grid(
-            self.canvas, x, y - theme_h,
-            keyword_w,
-            height - theme_h - summary_h, step)
-        
-        # Summary area
-        grid_renderer.draw_single_line_grid(
-            self.canvas, x, y - (height - summary_h),
-            width,
-            summary_h, step)
-        
-        # Title area
-        grid_renderer.draw_single_line_grid(
-            self.canvas, x, y - theme_h,
-            width,
-            theme_h, step)
-
-    def _draw_dotted_grid_layout(self, grid_renderer, x, y, width, height, 
-                               theme_h, summary_h, keyword_w, config):
-        """
-        Draw dotted grid pattern in all sections
-        """
-        # Convert mm values to points
-        dot_spacing = config.get("grid_dot_spacing_mm", 20) * MM_TO_POINTS
-        
-        # Notes area
-        grid_renderer.draw_dotted_grid(
-            self.canvas, x + keyword_w, y - theme_h,
-            width - keyword_w, height - theme_h - summary_h, dot_spacing)
-        
-        # Keywords area
-        grid_renderer.draw_dotted_grid(
-            self.canvas, x, y - theme_h,
-            keyword_w,
-            height - theme_h - summary_h, dot_spacing)
-        
-        # Summary area
-        grid_renderer.draw_dotted_grid(
-            self.canvas, x, y - (height - summary_h),
-            width,
-            summary_h, dot_spacing)
-        
-        # Title area
-        grid_renderer.draw_dotted_grid(
-            self.canvas, x, y - theme_h,
-            width,
-            theme_h, dot_spacing)
+        p.moveTo(x + keyword_w, y - theme_h)  # Keywords right
+        p.lineTo(x + keyword_w, y - height + summary_h)
+        self.canvas.drawPath(p, stroke=1, fill=0)
 
-    def _draw_english_grid_layout(self, grid_renderer, x, y, width, height, 
-                                theme_h, summary_h, keyword_w, config):
+    def _draw_grid_region(self, grid_fn, x, y, width, height, *params):
         """
-        Draw English writing practice grid in all sections
+        Draw one grid region through a named Form XObject, so regions with
+        identical size and parameters (across modules and pages) share a
+        single definition in the PDF instead of repeating their operators
         """
-        # Convert mm values to points
-        line_spacing = config.get("grid_line_spacing_mm", 8) * MM_TO_POINTS
-        
-        # Notes area
-        grid_renderer.draw_english_grid(
-            self.canvas, x + keyword_w, y - theme_h,
-            width - keyword_w, height - theme_h - summary_h, line_spacing)
-        
-        # Keywords area
-        grid_renderer.draw_english_grid(
-            self.canvas, x, y - theme_h,
-            keyword_w,
-            height - theme_h - summary_h, line_spacing)
-        
-        # Summary area
-        grid_renderer.draw_english_grid(
-            self.canvas, x, y - (height - summary_h),
-            width,
-            summary_h, line_spacing)
-        
-        # Title area
-        grid_renderer.draw_english_grid(
-            self.canvas, x, y - theme_h,
-            width,
-            theme_h, line_spacing)
+        c = self.canvas
+        # The geometry quantized to 2 decimals (invisible at print
+        # resolution) only identifies the form; the form content itself
+        # is drawn from the exact values, because the grid helpers count
+        # groups by floor division and regions are often sized to an
+        # exact multiple of the group height - rounding there flips the
+        # count across the boundary and adds or drops a whole group
+        key = (grid_fn.__name__, round(width, 2), round(height, 2)) + tuple(
+            round(p, 2) if isinstance(p, float) else p for p in params)
+        name = "".join(ch if ch.isalnum() else "_" for ch in str(key))
+        if not c.hasForm(name):
+            # Pad the bounding box slightly so strokes on the region edges
+            # are not clipped away by the form's BBox
+            c.beginForm(name, -1, -height - 1, width + 1, 1)
+            c._last_stroke = None
+            grid_fn(c, 0, 0, width, height, *params)
+            c.endForm()
+            c._last_stroke = None
+        c.saveState()
+        c.translate(round(x, 2), round(y, 2))
+        c.doForm(name)
+        c.restoreState()
 
-    def _draw_tianzige_grid_layout(self, grid_renderer, x, y, width, height, 
-                                 theme_h, summary_h, keyword_w, config):
+    def _grid_subregions(self, x, y, width, height, theme_h, summary_h,
+                         keyword_w, split_summary):
         """
-        Draw Tianzige grid in all sections
+        Sub-rectangles every line style fills with its grid: notes,
+        keywords, summary (one row, or two for the four-line grid) and
+        title, matching the old per-style layout helpers
         """
-        # Convert mm values to points
-        cell_size = config.get("grid_cell_size_mm", 30) * MM_TO_POINTS
-        
-        # Notes area
-        grid_renderer.draw_tianzige_grid(
-            self.canvas, x + keyword_w, y - theme_h,
-            width - keyword_w, height - theme_h - summary_h, cell_size)
-        
-        # Keywords area
-        grid_renderer.draw_tianzige_grid(
-            self.canvas, x, y - theme_h,
-            keyword_w,
-            height - theme_h - summary_h, cell_size)
-        
+        content_h = height - theme_h - summary_h
+        regions = [
+            # Notes area
+            (x + keyword_w, y - theme_h, width - keyword_w, content_h),
+            # Keywords area
+            (x, y - theme_h, keyword_w, content_h),
+        ]
         # Summary area
-        grid_renderer.draw_tianzige_grid(
-            self.canvas, x, y - (height - summary_h),
-            width,
-            summary_h, cell_size)
-        
+        if split_summary:
+            regions.append((x, y - (height - summary_h), width, summary_h / 2))
+            regions.append((x, y - (height - summary_h / 2), width, summary_h / 2))
+        else:
+            regions.append((x, y - (height - summary_h), width, summary_h))
         # Title area
-        grid_renderer.draw_tianzige_grid(
-            self.canvas, x, y - theme_h,
-            width,
-            theme_h, cell_size)
+        regions.append((x, y - theme_h, width, theme_h))
+        return regions
 
 
 class NotebookGenerator:
@@ -761,100 +1008,152 @@ class NotebookGenerator:
         """
         Generate Cornell notebook PDF based on configuration
         """
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            cfg = json.load(f)
+        # Create PDF canvas once, before processing pages; render into an
+        # in-memory buffer so the output file is written with one call
+        buf = io.BytesIO()
+        # Compress the content streams - grid pages are highly repetitive
+        # stroke operators, so this shrinks the output considerably
+        c = canvas.Canvas(buf, pageCompression=1)
 
+        with _no_shape_checking():
+            cfg = self.render_to(c)
         output = cfg.get("output", "notebook.pdf")
-        
+
+        c.save()
+        with open(output, "wb") as f:
+            f.write(buf.getvalue())
+        print(f"✅ Notebook template generated: {output}")
+
+    def render_to(self, c):
+        """
+        Render this config's pages onto an existing canvas (no save), so
+        several configs can share one canvas/PDF; returns the parsed config
+        """
+        cfg = _read_config(self.config_path)
+
         # Check if we have pages array (multi-page format) or single page config
         pages = cfg.get("pages", [])
         if not pages:
             # Handle single page configuration for backward compatibility
             pages = [cfg]
-        
-        # Create PDF canvas once, before processing pages
-        c = canvas.Canvas(output)
+
+        # Renderers are stateless apart from the canvas and font, so one
+        # instance of each serves every page
+        header_renderer = HeaderRenderer(c, self.font)
+        quote_renderer = QuoteBoxRenderer(c, self.font)
+        cornell_renderer = CornellModuleRenderer(c, self.font)
+        footer_renderer = FooterRenderer(c, self.font)
 
         # Process each page configuration
         for page_index, page_cfg in enumerate(pages):
-            
+            # Finish the previous page first (including one left open by an
+            # earlier config on a shared canvas)
+            if page_index > 0:
+                c.showPage()
+
             # 获取当前页的页面格式设置
-            format = page_cfg.get("page_format", {})
-            page_size_name = format.get("size", "A4")
-            page_size = PAPER_SIZES.get(page_size_name, A4) 
-            orientation = format.get("orientation", "portrait")
-            if orientation == "landscape":
-                W, H = landscape(page_size)
-            else:
-                W, H = portrait(page_size)
-                
+            format = page_cfg.get("page_format", _DEFAULT_PAGE_FORMAT)
+            (W, H, step, left_margin, right_margin,
+             top_margin, bottom_margin) = _resolve_page_format(format)
+
             # 为每一页设置页面尺寸
             c.setPageSize((W, H))
 
-            header_cfg = page_cfg.get("header", {})
-            footer_cfg = page_cfg.get("footer", {})
-            modules = page_cfg.get("modules", [])
-            # Get quote configuration separately
-            quote_cfg = page_cfg.get("quote", {})
-
-            header_h = header_cfg.get("height_mm", 0) * MM_TO_POINTS
-            footer_h = footer_cfg.get("height_mm", 0) * MM_TO_POINTS
-            # Get quote height from quote config in mm and convert to points
-            quote_h_mm = quote_cfg.get("height_mm", 0)
-            quote_h = quote_h_mm * MM_TO_POINTS
-
-            step = format.get("line_step_mm", 9) * MM_TO_POINTS
-
-            # Adjust margins with binding margin consideration
-            # For binding, we add extra base_margin to both sides to allow for proper hole punching/clipboarding
-            # Support for individual binding margins
-            base_margin = format.get("base_margin", 0)
-            left_binding_margin = format.get("left_binding_margin", 0)
-            right_binding_margin = format.get("right_binding_margin", 0)
-            top_binding_margin = format.get("top_binding_margin", 0)
-            bottom_binding_margin = format.get("bottom_binding_margin", 0)
-
-            left_margin = left_binding_margin + base_margin
-            right_margin = right_binding_margin + base_margin
-            top_margin = top_binding_margin + base_margin
-            bottom_margin = bottom_binding_margin + base_margin
-            usable_h = H - top_margin - bottom_margin - header_h - quote_h - footer_h
+            # Set the default font once per page; renderers only re-set it
+            # when the size changes (graphics state resets at showPage)
+            c.setFont(self.font, 12)
+            c._last_font = (self.font, 12)
+            # showPage reset the stroke color too
+            c._last_stroke = None
+
+            (header_cfg, footer_cfg, modules, quote_cfg,
+             header_h, footer_h, quote_h) = _resolve_page_layout(page_cfg)
+
+            # Page geometry shared by every section below
+            content_w = W - left_margin - right_margin
+            modules_top_y = H - top_margin - header_h - quote_h
+            usable_h = modules_top_y - bottom_margin - footer_h
 
             # Draw header (L0[0])
-            header_renderer = HeaderRenderer(c, self.font)
-            header_renderer.draw(left_margin, H - top_margin, W - left_margin - right_margin, header_h, header_cfg)
+            header_renderer.draw(left_margin, H - top_margin, content_w, header_h, header_cfg)
 
             # Draw quote area (L0[1]) - now handled separately from header
             if quote_cfg:
-                quote_y = H - top_margin - header_h - quote_h
-                quote_renderer = QuoteBoxRenderer(c, self.font)
-                quote_renderer.draw(left_margin, quote_y, W - left_margin - right_margin, quote_h, quote_cfg)
+                quote_renderer.draw(left_margin, modules_top_y, content_w, quote_h, quote_cfg)
 
             # Draw Cornell modules (L0[2])
-            if modules:
-                Unused_space = usable_h - (usable_h // (step * len(modules))) * (step * len(modules))
-                module_h = (usable_h // (step * len(modules))) * step
-                y = H - top_margin - header_h - quote_h
+            n_modules = len(modules)
+            if n_modules == 1:
+                # Common single-module page: no per-module split to compute
+                module_h = (usable_h // step) * step
+                cornell_renderer.draw(left_margin, modules_top_y, content_w,
+                                      module_h, modules[0])
+            elif n_modules:
+                module_h = (usable_h // (step * n_modules)) * step
+                y = modules_top_y
                 for m in modules:
-                    cornell_renderer = CornellModuleRenderer(c, self.font)
-                    cornell_renderer.draw(left_margin, y, W - left_margin - right_margin, module_h, m)
+                    cornell_renderer.draw(left_margin, y, content_w, module_h, m)
                     y -= module_h
 
             # Draw footer (L0[3])
-            footer_renderer = FooterRenderer(c, self.font)
-            footer_renderer.draw(left_margin, bottom_margin, W - left_margin - right_margin, footer_h, footer_cfg)
+            footer_renderer.draw(left_margin, bottom_margin, content_w, footer_h, footer_cfg)
+
+        return cfg
+
+
+def generate_notebook(config_path):
+    """
+    Generate one notebook PDF; module-level so worker processes can call it
+    """
+    generator = NotebookGenerator(config_path)
+    generator.generate()
+
 
-            # Add a new page for the next iteration (except for the last page)
-            if page_index < len(pages) - 1:
+def generate_many(config_paths, output):
+    """
+    Render several configs into one PDF on a shared canvas; fonts, cached
+    string widths and form XObjects are set up once for the whole batch
+    """
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pageCompression=1)
+    with _no_shape_checking():
+        for i, config_path in enumerate(config_paths):
+            if i > 0:
                 c.showPage()
-        c.save()
-        print(f"✅ Notebook template generated: {output}")
+            NotebookGenerator(config_path).render_to(c)
+    c.save()
+    with open(output, "wb") as f:
+        f.write(buf.getvalue())
+    print(f"✅ Notebook template generated: {output}")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python Cornell_gen_1102.py config.json")
+    args = sys.argv[1:]
+    # Optional profiling of the generation itself (the workload is
+    # compute-bound in Python/zlib, not disk-bound - the profile shows
+    # where the time actually goes before optimizing further)
+    profile = "--profile" in args
+    if profile:
+        args = [a for a in args if a != "--profile"]
+    if not args:
+        print("Usage: python Cornell_gen_1102.py [--profile] config.json [more_configs.json ...]")
         sys.exit(1)
 
-    generator = NotebookGenerator(sys.argv[1])
-    generator.generate()
\ No newline at end of file
+    config_paths = args
+    if profile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.enable()
+        for config_path in config_paths:
+            generate_notebook(config_path)
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+    elif len(config_paths) == 1:
+        generate_notebook(config_paths[0])
+    else:
+        # Each config produces an independent PDF, so batch generation can
+        # fan out across worker processes
+        from multiprocessing import Pool
+        with Pool(min(len(config_paths), os.cpu_count() or 1)) as pool:
+            pool.map(generate_notebook, config_paths)
\ No newline at end of file
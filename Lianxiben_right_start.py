@@ -1,5 +1,6 @@
 import matplotlib.pyplot as plt
-from matplotlib.lines import Line2D
+import numpy as np
+from matplotlib.collections import LineCollection
 import math
 
 # --- Page & layout parameters (all units in mm) ---
@@ -40,36 +41,15 @@ grid_configs = {
 # Select notebook type (change this to switch between types)
 notebook_type = "英语抄写本（成人）"  # Options: "幼儿拼音本", "小学拼音本（标准）", "英语抄写本（成人）"
 
-# Grid cell parameters based on selected type
-selected_config = grid_configs[notebook_type]
-upper_h = selected_config["upper_h"]
-middle_h = selected_config["middle_h"]
-lower_h = selected_config["lower_h"]
-intercell_gap = selected_config["intercell_gap"]
-cell_pitch = upper_h + middle_h + lower_h + intercell_gap
-
 # --- Matplotlib figure setup (convert mm to inches) ---
 mm_to_in = 1.0 / 25.4
 fig_w_in = A4_w_mm * mm_to_in
 fig_h_in = A4_h_mm * mm_to_in
+# One figure shared by every render() call: batch generation of several
+# notebook types clears and redraws it instead of paying figure setup
+# per type
 fig = plt.figure(figsize=(fig_w_in, fig_h_in), dpi=300)
 ax = fig.add_axes([0, 0, 1, 1])
-ax.set_xlim(0, A4_w_mm)
-ax.set_ylim(0, A4_h_mm)
-ax.set_axis_off()
-
-# Calculate optimal margins to balance top and bottom space
-# We want to distribute remaining space equally between top and bottom margins
-
-# Store initial margin values
-initial_top_margin = top_margin
-initial_bottom_margin = bottom_margin
-content_height = A4_h_mm - initial_top_margin - initial_bottom_margin
-full_cells = math.floor(content_height / cell_pitch)
-used_height = full_cells * cell_pitch
-remaining_space = content_height - used_height
-top_margin = initial_top_margin + remaining_space / 2
-bottom_margin = initial_bottom_margin + remaining_space / 2
 
 # Colors and styles (user-specified)
 color_light_gray = "#cccccc"
@@ -83,72 +63,118 @@ titles_right_to_left = ["day2:", "day7:", "day15:", "day28:", "day49:", "day1&83
 usable_width = A4_w_mm - binding_width - left_margin - right_margin
 col_width = usable_width / num_content_cols
 
-# Helper to draw a horizontal line across a specific x-range
-def draw_hline(x0, x1, y, color, linestyle='solid', linewidth=0.8):
-    ax.add_line(Line2D([x0, x1], [y, y], linewidth=linewidth, color=color, linestyle=linestyle, solid_capstyle='butt'))
-
-# Draw column separators (mirrored)
-x_binding_right = A4_w_mm - binding_width
-ax.add_line(Line2D([x_binding_right, x_binding_right], [0, A4_h_mm], linewidth=0.5, color=sep_color, linestyle='solid'))
-
-for i in range(1, num_content_cols):
-    x = A4_w_mm - binding_width - left_margin - i * col_width
-    ax.add_line(Line2D([x, x], [0, A4_h_mm], linewidth=0.6, color=sep_color, linestyle=(0, (3,3))))
-
-# Draw outer borders lightly (optional)
-draw_hline(0, A4_w_mm, 0, color_light_gray, linestyle='solid', linewidth=0.6)
-draw_hline(0, A4_w_mm, A4_h_mm, color_light_gray, linestyle='solid', linewidth=0.6)
-ax.add_line(Line2D([0, 0], [0, A4_h_mm], linewidth=0.6, color=color_light_gray))
-ax.add_line(Line2D([A4_w_mm, A4_w_mm], [0, A4_h_mm], linewidth=0.6, color=color_light_gray))
-
-# Draw grid cells in each content column (mirrored)
-start_y = A4_h_mm - top_margin
-end_y = bottom_margin
-y = start_y
-
-x_content_left = A4_w_mm - binding_width - left_margin - num_content_cols * col_width
-x_content_right = A4_w_mm - binding_width - left_margin
-
-y_pos = start_y
-row_count = 0
-# Check that we have enough space for at least one cell before entering loop
-if y_pos - cell_pitch >= end_y:
-    while True:
-        line1_y = y_pos
-        line2_y = y_pos - upper_h
-        line3_y = y_pos - upper_h - middle_h
-        line4_y = y_pos - upper_h - middle_h - lower_h
-
-        if line4_y < end_y:
-            break
-
-        draw_hline(x_content_left, x_content_right, line1_y, color_light_gray, linestyle=(0, (2,2)), linewidth=0.6)
-        draw_hline(x_content_left, x_content_right, line2_y, color_light_blue, linestyle=(0, (3,3)), linewidth=0.8)
-        #draw_hline(x_content_left, x_content_right, line3_y, color_light_blue, linestyle='solid', linewidth=0.8)
-        draw_hline(x_content_left, x_content_right, line4_y, color_light_gray, linestyle='solid', linewidth=0.8)
-
-        y_pos = line4_y - intercell_gap
-        row_count += 1
-
-ax.add_line(Line2D([x_content_left, x_content_left], [0, A4_h_mm], linewidth=0.6, color=color_light_gray, linestyle='solid'))
-ax.add_line(Line2D([x_content_right, x_content_right], [0, A4_h_mm], linewidth=0.6, color=color_light_gray, linestyle='solid'))
-
-# Write titles at top of each content column from right to left (mirrored)
-fontdict = {"fontsize": 9, "ha": "left", "va": "bottom"}
-for i in range(num_content_cols):
-    col_x0 = A4_w_mm - binding_width - left_margin - (i + 1) * col_width
-    col_x1 = col_x0 + col_width
-    # Changed from center_x to left-aligned position with small padding
-    text_x = col_x0 + 1.0  # Small padding from left edge
-    idx_from_right = num_content_cols - 1 - i
-    title = titles_right_to_left[idx_from_right]
-    ax.text(text_x, A4_h_mm - top_margin + 1.5, title, fontdict=fontdict)
-#标注装订区域 (mirrored)
-ax.text(A4_w_mm - binding_width/2.0, A4_h_mm - top_margin + 1.5, "装订", fontdict={"fontsize":8, "ha":"center", "va":"bottom"}, rotation=90, bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.7))
-
-# Save to PDF and PNG - using local directory instead of /mnt/data/
-out_pdf = f"four_line_three_grid_{notebook_type}_a4_landscape_right_start.pdf"
-out_png = f"four_line_three_grid_{notebook_type}_a4_landscape_right_start.png"
-plt.savefig(out_pdf, bbox_inches='tight', pad_inches=0)
-plt.savefig(out_png, bbox_inches='tight', pad_inches=0)
-plt.close(fig)
\ No newline at end of file
+# Helper to add a batch of segments as one LineCollection: matplotlib
+# then renders a single artist per stroke style instead of one Line2D
+# per line
+def add_lines(segments, color, linestyle='solid', linewidth=0.8, crisp=False):
+    lc = LineCollection(
+        segments, colors=color, linestyles=linestyle, linewidths=linewidth,
+        capstyle='butt', zorder=2)
+    if crisp:
+        # Guide lines are axis-aligned: snapping them to the pixel grid
+        # and skipping antialiasing gives sharper rules and cheaper Agg
+        # rasterization at 300 dpi
+        lc.set_antialiased(False)
+        lc.set_snap(True)
+    ax.add_collection(lc)
+
+
+def render(nb_type):
+    """
+    Draw one notebook type onto the shared figure and save PDF + PNG
+    """
+    ax.clear()
+    ax.set_xlim(0, A4_w_mm)
+    ax.set_ylim(0, A4_h_mm)
+    ax.set_axis_off()
+
+    # Grid cell parameters based on selected type
+    selected_config = grid_configs[nb_type]
+    upper_h = selected_config["upper_h"]
+    middle_h = selected_config["middle_h"]
+    lower_h = selected_config["lower_h"]
+    intercell_gap = selected_config["intercell_gap"]
+    cell_pitch = upper_h + middle_h + lower_h + intercell_gap
+
+    # Calculate optimal margins to balance top and bottom space
+    # We want to distribute remaining space equally between top and bottom margins
+    content_height = A4_h_mm - top_margin - bottom_margin
+    full_cells = math.floor(content_height / cell_pitch)
+    used_height = full_cells * cell_pitch
+    remaining_space = content_height - used_height
+    top_m = top_margin + remaining_space / 2
+    bottom_m = bottom_margin + remaining_space / 2
+
+    # Draw column separators (mirrored)
+    x_binding_right = A4_w_mm - binding_width
+    add_lines([[(x_binding_right, 0), (x_binding_right, A4_h_mm)]], sep_color, 'solid', 0.5)
+
+    col_sep_segs = []
+    for i in range(1, num_content_cols):
+        x = A4_w_mm - binding_width - left_margin - i * col_width
+        col_sep_segs.append([(x, 0), (x, A4_h_mm)])
+    add_lines(col_sep_segs, sep_color, (0, (3,3)), 0.6)
+
+    # Draw outer borders lightly (optional)
+    add_lines([[(0, 0), (A4_w_mm, 0)],
+               [(0, A4_h_mm), (A4_w_mm, A4_h_mm)],
+               [(0, 0), (0, A4_h_mm)],
+               [(A4_w_mm, 0), (A4_w_mm, A4_h_mm)]], color_light_gray, 'solid', 0.6)
+
+    # Draw grid cells in each content column (mirrored)
+    start_y = A4_h_mm - top_m
+    end_y = bottom_m
+
+    x_content_left = A4_w_mm - binding_width - left_margin - num_content_cols * col_width
+    x_content_right = A4_w_mm - binding_width - left_margin
+
+    # All row positions come from one vectorized computation instead of the
+    # old accumulating while-loop: a row fits while its bottom line (line 4)
+    # stays above end_y, with the original guard that at least one full
+    # cell pitch must be available
+    cell_h = upper_h + middle_h + lower_h
+    row_count = 0
+    if start_y - cell_pitch >= end_y:
+        row_count = int((start_y - cell_h - end_y) // cell_pitch) + 1
+    line1_ys = (start_y - np.arange(row_count) * cell_pitch).tolist()
+    line2_ys = (start_y - upper_h - np.arange(row_count) * cell_pitch).tolist()
+    line4_ys = (start_y - cell_h - np.arange(row_count) * cell_pitch).tolist()
+    gray_dashed_segs = [[(x_content_left, y), (x_content_right, y)] for y in line1_ys]   # line 1 of each cell
+    blue_segs = [[(x_content_left, y), (x_content_right, y)] for y in line2_ys]
+    # line 3 is intentionally not drawn in the right-start layout
+    gray_solid_segs = [[(x_content_left, y), (x_content_right, y)] for y in line4_ys]  # line 4
+
+    add_lines(gray_dashed_segs, color_light_gray, (0, (2,2)), 0.6, crisp=True)
+    add_lines(blue_segs, color_light_blue, (0, (3,3)), 0.8)
+    add_lines(gray_solid_segs, color_light_gray, 'solid', 0.8, crisp=True)
+
+    add_lines([[(x_content_left, 0), (x_content_left, A4_h_mm)],
+               [(x_content_right, 0), (x_content_right, A4_h_mm)]],
+              color_light_gray, 'solid', 0.6)
+
+    # Write titles at top of each content column from right to left (mirrored)
+    fontdict = {"fontsize": 9, "ha": "left", "va": "bottom"}
+    for i in range(num_content_cols):
+        col_x0 = A4_w_mm - binding_width - left_margin - (i + 1) * col_width
+        col_x1 = col_x0 + col_width
+        # Changed from center_x to left-aligned position with small padding
+        text_x = col_x0 + 1.0  # Small padding from left edge
+        idx_from_right = num_content_cols - 1 - i
+        title = titles_right_to_left[idx_from_right]
+        ax.text(text_x, A4_h_mm - top_m + 1.5, title, fontdict=fontdict)
+    #标注装订区域 (mirrored)
+    ax.text(A4_w_mm - binding_width/2.0, A4_h_mm - top_m + 1.5, "装订", fontdict={"fontsize":8, "ha":"center", "va":"bottom"}, rotation=90, bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.7))
+
+    # Save to PDF and PNG - using local directory instead of /mnt/data/
+    out_pdf = f"four_line_three_grid_{nb_type}_a4_landscape_right_start.pdf"
+    out_png = f"four_line_three_grid_{nb_type}_a4_landscape_right_start.png"
+    # No bbox_inches='tight': the axes already fill the figure exactly, so
+    # tight-cropping only added a second measuring render and trimmed the
+    # page away from true A4
+    fig.savefig(out_pdf)
+    fig.savefig(out_png)
+
+
+if __name__ == "__main__":
+    render(notebook_type)
+    plt.close(fig)
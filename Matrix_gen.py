@@ -1,6 +1,4 @@
-import matplotlib.pyplot as plt
-from matplotlib.lines import Line2D
-import math
+import io
 import json
 import sys
 from reportlab.lib.pagesizes import A4, landscape, portrait
@@ -32,7 +30,9 @@ class MatrixNotebookGenerator:
         else:
             W, H = portrait(page_size)
 
-        c = canvas.Canvas(output, pagesize=(W, H))
+        # Build the PDF in memory and write the file once at the end
+        buf = io.BytesIO()
+        c = canvas.Canvas(buf, pagesize=(W, H), pageCompression=1)
         
         # Get margins
         margin = page_cfg.get("margin", 20)
@@ -59,25 +59,45 @@ class MatrixNotebookGenerator:
         
         # Create renderer
         renderer = AreaMatrixRenderer(c, self.font)
-        
-        # Draw all cells
-        for row in range(rows):
-            for col in range(cols):
-                # Calculate cell position
-                x = margin + col * cell_width
-                y = H - margin - (row + 1) * cell_height
-                
-                # Get configuration for this cell
-                config = cell_defaults.copy()
-                if (row, col) in cell_config_map:
-                    # Merge special configuration with defaults
-                    config.update(cell_config_map[(row, col)])
-                
-                # Render the cell
-                renderer.draw(x, y, cell_width, cell_height, config)
-        
+
+        # Fast path: a uniform matrix of plain solid black full borders
+        # (no special cells, no per-cell grid or text) is just a lattice,
+        # which c.grid() draws in one call - shared cell edges are then
+        # also stroked once instead of twice
+        plain_defaults = (
+            not cell_config_map
+            and cell_defaults.get("border_enabled", False)
+            and cell_defaults.get("border_style", "solid") == "solid"
+            and cell_defaults.get("border_color", "black") == "black"
+            and all(cell_defaults.get("border_sides", {}).get(side, True)
+                    for side in ("top", "bottom", "left", "right"))
+            and not cell_defaults.get("grid_type")
+            and not cell_defaults.get("fill_text"))
+        if plain_defaults:
+            xs = [margin + col * cell_width for col in range(cols + 1)]
+            ys = [H - margin - row * cell_height for row in range(rows + 1)]
+            c.grid(xs, ys)
+        else:
+            # Cell positions computed once per row/column instead of two
+            # multiplications per cell in the inner loop
+            xs = [margin + col * cell_width for col in range(cols)]
+            ys = [H - margin - (row + 1) * cell_height for row in range(rows)]
+            # Draw all cells
+            for row, y in enumerate(ys):
+                for col, x in enumerate(xs):
+                    # Get configuration for this cell; only cells with a
+                    # special entry pay for a merged copy, the rest share
+                    # the defaults dict as-is
+                    special = cell_config_map.get((row, col))
+                    config = {**cell_defaults, **special} if special else cell_defaults
+
+                    # Render the cell
+                    renderer.draw(x, y, cell_width, cell_height, config)
+
         c.showPage()
         c.save()
+        with open(output, "wb") as f:
+            f.write(buf.getvalue())
         print(f"✅ Matrix notebook generated: {output}")
 
 if __name__ == "__main__":